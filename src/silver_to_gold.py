@@ -11,96 +11,187 @@ with aggregations and business logic using pandas instead of PySpark.
 import os
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
 
-def create_sales_summary(silver_dir, gold_dir):
+
+def create_gold_views_duckdb(silver_dir, gold_dir):
     """
-    Create sales summary view in gold layer
+    Build all three gold views with DuckDB reading the silver Parquet
+    files directly: the group-bys and joins run in its multi-threaded
+    vectorized engine, parallelized across row groups, without
+    materializing the joined frames in pandas
     """
-    # Read sales data from silver
     sales_path = os.path.join(silver_dir, "AdventureWorks_Sales.parquet")
-    sales_df = pd.read_parquet(sales_path)
-    
-    # Read products data from silver
     products_path = os.path.join(silver_dir, "AdventureWorks_Products.parquet")
-    products_df = pd.read_parquet(products_path)
-    
-    # Join sales and products
-    joined_df = sales_df.merge(products_df, on='ProductKey')
-    
-    # Create sales summary
-    sales_summary = joined_df.groupby(['ProductKey', 'ProductName', 'ModelName']).agg(
+    customers_path = os.path.join(silver_dir, "AdventureWorks_Customers.parquet")
+
+    con = duckdb.connect()
+    copy_opts = "(FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 131072)"
+
+    # Sales summary
+    con.execute(f"""
+        COPY (
+            SELECT s.ProductKey, p.ProductName, p.ModelName,
+                   CAST(SUM(s.OrderQuantity) AS BIGINT) AS TotalQuantity,
+                   SUM(s.SalesAmount) AS TotalSales,
+                   AVG(s.UnitPrice) AS AvgUnitPrice,
+                   COUNT(*) AS OrderCount
+            FROM read_parquet('{sales_path}') s
+            LEFT JOIN read_parquet('{products_path}') p USING (ProductKey)
+            GROUP BY 1, 2, 3
+            ORDER BY TotalSales DESC
+        ) TO '{os.path.join(gold_dir, "sales_summary.parquet")}' {copy_opts}
+    """)
+
+    # Customer insights
+    con.execute(f"""
+        COPY (
+            SELECT s.CustomerKey, c.FirstName, c.LastName, c.Gender,
+                   c.MaritalStatus,
+                   SUM(s.SalesAmount) AS TotalSpend,
+                   COUNT(*) AS OrderCount,
+                   AVG(s.SalesAmount) AS AvgOrderValue
+            FROM read_parquet('{sales_path}') s
+            JOIN read_parquet('{customers_path}') c USING (CustomerKey)
+            GROUP BY 1, 2, 3, 4, 5
+            ORDER BY TotalSpend DESC
+        ) TO '{os.path.join(gold_dir, "customer_insights.parquet")}' {copy_opts}
+    """)
+
+    # Monthly sales (Year/Month straight from OrderDate, no calendar join)
+    con.execute(f"""
+        COPY (
+            SELECT CAST(YEAR(OrderDate) AS SMALLINT) AS Year,
+                   CAST(MONTH(OrderDate) AS TINYINT) AS Month,
+                   SUM(SalesAmount) AS MonthlySales,
+                   COUNT(*) AS OrderCount,
+                   AVG(SalesAmount) AS AvgOrderValue
+            FROM read_parquet('{sales_path}')
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+        ) TO '{os.path.join(gold_dir, "monthly_sales.parquet")}' {copy_opts}
+    """)
+    con.close()
+
+
+def _read_silver(silver_dir, name, columns=None):
+    """
+    Load one silver Parquet file into pandas via a memory-mapped Arrow
+    read, avoiding a second buffered copy of the file cache. Passing
+    columns restricts IO and decode to just those column chunks.
+    """
+    table = pq.read_table(os.path.join(silver_dir, name), memory_map=True,
+                          columns=columns)
+    return table.to_pandas(self_destruct=True)
+
+
+def create_sales_summary(sales_df, products_df, gold_dir):
+    """
+    Create sales summary view in gold layer
+    """
+    # Aggregate on the integer product key first, then attach the product
+    # attributes: the join now runs over a few hundred summary rows
+    # instead of every sales line, and the groupby hashes a single int key
+    sales_summary = sales_df.groupby('ProductKey', sort=False).agg(
         TotalQuantity=('OrderQuantity', 'sum'),
         TotalSales=('SalesAmount', 'sum'),
         AvgUnitPrice=('UnitPrice', 'mean'),
         OrderCount=('OrderQuantity', 'count')
-    ).reset_index().sort_values('TotalSales', ascending=False)
+    )
+
+    # Pin the aggregate to int64 as an explicit schema contract with the
+    # DuckDB view's CAST(SUM(...) AS BIGINT), independent of what dtype
+    # pandas happens to return for an int16 column's sum
+    sales_summary['TotalQuantity'] = sales_summary['TotalQuantity'].astype('int64')
+
+    sales_summary = sales_summary.reset_index().merge(
+        products_df[['ProductKey', 'ProductName', 'ModelName']],
+        on='ProductKey', how='left'
+    ).sort_values('TotalSales', ascending=False)
+
+    # Keep the view's column order stable
+    sales_summary = sales_summary[['ProductKey', 'ProductName', 'ModelName',
+                                   'TotalQuantity', 'TotalSales',
+                                   'AvgUnitPrice', 'OrderCount']]
     
     # Write to gold
     sales_summary_path = os.path.join(gold_dir, "sales_summary.parquet")
-    sales_summary.to_parquet(sales_summary_path)
+    sales_summary.to_parquet(sales_summary_path, index=False,
+                             engine='pyarrow', compression='zstd',
+                             compression_level=3)
     
     return sales_summary
 
 
-def create_customer_insights(silver_dir, gold_dir):
+def create_customer_insights(sales_df, customers_df, gold_dir):
     """
     Create customer insights view in gold layer
     """
-    # Read customers data from silver
-    customers_path = os.path.join(silver_dir, "AdventureWorks_Customers.parquet")
-    customers_df = pd.read_parquet(customers_path)
-    
-    # Read sales data from silver
-    sales_path = os.path.join(silver_dir, "AdventureWorks_Sales.parquet")
-    sales_df = pd.read_parquet(sales_path)
-    
-    # Join customers and sales
-    joined_df = sales_df.merge(customers_df, on='CustomerKey')
-    
-    # Create customer insights
-    customer_insights = joined_df.groupby(['CustomerKey', 'FirstName', 'LastName', 'Gender', 'MaritalStatus']).agg(
+    # Aggregate per customer key first, then attach the customer
+    # attributes — same aggregate-then-join flip as the sales summary.
+    # The inner join also drops customers with no sales, matching the
+    # original sales-to-customers merge.
+    customer_insights = sales_df.groupby('CustomerKey', sort=False).agg(
         TotalSpend=('SalesAmount', 'sum'),
         OrderCount=('OrderQuantity', 'count'),
         AvgOrderValue=('SalesAmount', 'mean')
-    ).reset_index().sort_values('TotalSpend', ascending=False)
+    ).reset_index().merge(
+        customers_df[['CustomerKey', 'FirstName', 'LastName', 'Gender',
+                      'MaritalStatus']],
+        on='CustomerKey', how='inner'
+    ).sort_values('TotalSpend', ascending=False)
+
+    # Keep the view's column order stable
+    customer_insights = customer_insights[['CustomerKey', 'FirstName',
+                                           'LastName', 'Gender',
+                                           'MaritalStatus', 'TotalSpend',
+                                           'OrderCount', 'AvgOrderValue']]
     
     # Write to gold
     customer_insights_path = os.path.join(gold_dir, "customer_insights.parquet")
-    customer_insights.to_parquet(customer_insights_path)
+    customer_insights.to_parquet(customer_insights_path, index=False,
+                                 engine='pyarrow', compression='zstd',
+                                 compression_level=3)
     
     return customer_insights
 
 
-def create_time_series_analysis(silver_dir, gold_dir):
+def create_time_series_analysis(sales_df, gold_dir):
     """
     Create time series analysis view in gold layer
     """
-    # Read sales data from silver
-    sales_path = os.path.join(silver_dir, "AdventureWorks_Sales.parquet")
-    sales_df = pd.read_parquet(sales_path)
-    
-    # Read calendar data from silver
-    calendar_path = os.path.join(silver_dir, "AdventureWorks_Calendar.parquet")
-    calendar_df = pd.read_parquet(calendar_path)
-    
-    # Join sales and calendar
-    joined_df = sales_df.merge(
-        calendar_df,
-        left_on='OrderDate',
-        right_on='Date'
-    )
-    
-    # Create time series analysis by month
-    monthly_sales = joined_df.groupby(['Year', 'Month']).agg(
+    # The monthly aggregation only needs year and month, which come
+    # straight from OrderDate truncated to month precision — no hash join
+    # against the calendar table required
+    order_month = sales_df['OrderDate'].to_numpy().astype('datetime64[M]')
+
+    # Create time series analysis by month: group with sort=False so the
+    # full-length month array isn't label-sorted, then put the handful of
+    # aggregated rows in chronological order
+    monthly_sales = sales_df.groupby(order_month, sort=False).agg(
         MonthlySales=('SalesAmount', 'sum'),
         OrderCount=('OrderQuantity', 'count'),
         AvgOrderValue=('SalesAmount', 'mean')
-    ).reset_index().sort_values(['Year', 'Month'])
+    ).sort_index()
+
+    # Split the month key back into narrow Year/Month columns
+    months = monthly_sales.index.to_numpy().astype('datetime64[M]')
+    monthly_sales.insert(0, 'Year',
+                         (months.astype('datetime64[Y]').astype(np.int64) + 1970).astype(np.int16))
+    monthly_sales.insert(1, 'Month',
+                         (months.astype(np.int64) % 12 + 1).astype(np.int8))
+    monthly_sales = monthly_sales.reset_index(drop=True)
     
     # Write to gold
     monthly_sales_path = os.path.join(gold_dir, "monthly_sales.parquet")
-    monthly_sales.to_parquet(monthly_sales_path)
+    monthly_sales.to_parquet(monthly_sales_path, index=False,
+                             engine='pyarrow', compression='zstd',
+                             compression_level=3)
     
     return monthly_sales
 
@@ -116,17 +207,42 @@ def main():
     
     # Create gold directory if it doesn't exist
     os.makedirs(gold_dir, exist_ok=True)
-    
+
+    # Prefer pushing the aggregations down to DuckDB when it is
+    # installed; the pandas implementations below remain the fallback
+    if duckdb is not None:
+        create_gold_views_duckdb(silver_dir, gold_dir)
+        print("Gold views created successfully (DuckDB)")
+        return
+
+    # Load each silver table once and share it across the views, so the
+    # sales fact is decoded a single time instead of once per view
+    # (calendar is no longer needed since monthly sales derives Year/Month
+    # from OrderDate directly)
+    # Project only the columns the views actually aggregate — parquet is
+    # columnar, so everything else is skipped entirely at read time
+    sales_df = _read_silver(
+        silver_dir, "AdventureWorks_Sales.parquet",
+        columns=['OrderDate', 'ProductKey', 'CustomerKey', 'OrderQuantity',
+                 'UnitPrice', 'SalesAmount'])
+    products_df = _read_silver(
+        silver_dir, "AdventureWorks_Products.parquet",
+        columns=['ProductKey', 'ProductName', 'ModelName'])
+    customers_df = _read_silver(
+        silver_dir, "AdventureWorks_Customers.parquet",
+        columns=['CustomerKey', 'FirstName', 'LastName', 'Gender',
+                 'MaritalStatus'])
+
     # Create sales summary
-    create_sales_summary(silver_dir, gold_dir)
+    create_sales_summary(sales_df, products_df, gold_dir)
     print("Sales summary created successfully")
-    
+
     # Create customer insights
-    create_customer_insights(silver_dir, gold_dir)
+    create_customer_insights(sales_df, customers_df, gold_dir)
     print("Customer insights created successfully")
-    
+
     # Create time series analysis
-    create_time_series_analysis(silver_dir, gold_dir)
+    create_time_series_analysis(sales_df, gold_dir)
     print("Time series analysis created successfully")
 
 